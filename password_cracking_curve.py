@@ -4,102 +4,228 @@ Password Cracking Progress Visualization Tool
 Visualize hashcat password cracking progress in real-time with interactive curves.
 """
 
-import json
+import array
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dash import Dash, dcc, html, callback_context
+from dash import Dash, dcc, html, callback_context, no_update, Patch
 from dash.dependencies import Output, Input, State
 import plotly.graph_objects as go
+import numpy as np
 import argparse
 
+try:
+    from orjson import loads as json_loads, JSONDecodeError
+except ImportError:
+    from json import loads as json_loads, JSONDecodeError
+
+# Status files can grow to several GB, read them in large chunks
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Curves longer than this many points are downsampled to about one point per bucket
+# of DOWNSAMPLE_RATE points
+DOWNSAMPLE_THRESHOLD = 1000
+DOWNSAMPLE_RATE = 60
+
+# Raw values recorded for every status line, the plotted axes are derived from them
+CURVE_COLUMNS = ("guesses", "elapsed_seconds", "cracked", "total")
+
+# Shared default for status lines without a "guess" entry, never modified
+_EMPTY = {}
+
+# How a complete status record ends, the last one can lack its line break
+_RECORD_ENDINGS = (b"}\n", b"}\r\n", b"}")
+
+# Phase identifier before the first status line, never equal to a real phase key
+_NO_PHASE = object()
+
+# Point the first curve starts from, one value per column of CURVE_COLUMNS
+_ORIGIN = ((0,), (0,), (0,), (1,))
+
 
 class HashcatStatusParser:
     """Parse and process Hashcat JSON status outputs."""
 
-    def __init__(self, filename, x_axis_type='guesses', y_axis_type='percentage', status_timer=1):
+    def __init__(self, filename, status_timer=1):
         self.filename = filename
-        self.x_axis_type = x_axis_type
-        self.y_axis_type = y_axis_type
         self.status_timer = status_timer
+        # (time_start, guess_base, guess_mod) as found in the file -> phase info, see _make_phase
+        # The same key object is returned for every line of a phase so that phase
+        # changes can be detected by identity
+        self._label_cache = {}
+        # Refreshes may overlap, only one of them can extend the curves at a time
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop the incremental parsing state and start again from the beginning of the file."""
+        self._offset = 0
+        self._curves = []
+        self._arrays = []
+        self._phases = []
+        self._guesses = 0
+        self._elapsed = 0
+        self._current_identifier = _NO_PHASE
+        # (device, inode) of the file the state was built from
+        self._file_id = None
+        # (device, inode, mtime, size) of the file when it was last parsed and what
+        # was returned then
+        self._last_stat = None
+        self._cached_result = None
 
     def parse_status_file(self):
         """
         Parse Hashcat JSON lines and group points by (guess_base, guess_mod).
-        Returns curves data for plotting.
+        Hashcat only appends to the status file, so each call only reads the lines
+        written since the previous one and extends the curves accumulated so far.
+        Returns curves data for plotting, one dict of NumPy arrays per curve with the
+        columns listed in CURVE_COLUMNS, along with one (phase key, legend label,
+        is potfile attack) tuple per curve.
         """
-        curves_x = []
-        curves_y = []
-        label_list = []
+        with self._lock:
+            return self._parse_new_lines()
 
+    def _parse_new_lines(self):
+        """Read the lines appended since the last call and extend the curves with them."""
         path = Path(self.filename)
-        if not path.exists():
-            return curves_x, curves_y, label_list
-
-        guesses = 0
-        current_identifier = ""
-        elapsed_seconds = 0
-
-        with open(self.filename, "r", encoding="utf-8") as f:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return self._curve_arrays(), self._phases
+
+        # Nothing was written since the last call
+        file_id = (st.st_dev, st.st_ino)
+        stat_key = file_id + (st.st_mtime_ns, st.st_size)
+        if stat_key == self._last_stat and self._cached_result is not None:
+            return self._cached_result
+
+        # File was truncated or replaced, parse it again from scratch
+        if st.st_size < self._offset or file_id != self._file_id:
+            self._reset()
+            self._file_id = file_id
+
+        curves = self._curves
+        phases = self._phases
+        label_cache = self._label_cache
+        offset = self._offset
+        guesses = self._guesses
+        current_identifier = self._current_identifier
+        elapsed_seconds = self._elapsed
+        status_timer = self.status_timer
+
+        # Curve being extended and its bound appends
+        curve = curves[-1] if curves else _ORIGIN
+        if curves:
+            append_guesses, append_elapsed, append_cracked, append_total = \
+                [column.append for column in curve]
+
+        with open(self.filename, "rb", buffering=READ_BUFFER_SIZE) as f:
+            f.seek(offset)
+            # The buffered reader splits lines in C, splitting os.read() chunks in Python
+            # instead measured about 1.5 times slower with bytes.split and about 4 times
+            # slower with bytes.find
             for line in f:
-                line = line.strip()
-                if not line.startswith("{"):
+                partial = not line.endswith(b"\n")
+
+                # Skip banner text, JSON lines that are not status records and truncated
+                # records without parsing them
+                if line[:1] != b"{" or b'"progress"' not in line or not line.endswith(_RECORD_ENDINGS):
+                    if partial and line[:1] == b"{":
+                        # Last line is still being written by hashcat, read it again next time
+                        break
+                    offset += len(line)
                     continue
 
                 try:
-                    data = json.loads(line)
-
-                    # Extract core values
-                    progress = data.get("progress", [0])[0]
-                    guesses += progress
-
-                    recovered = data.get("recovered_hashes", [0, 0])
-                    cracked = recovered[0]
-                    total = recovered[1] if recovered[1] > 0 else 1
-
-                    # X-axis value
-                    if self.x_axis_type == 'time':
-                        x_value = elapsed_seconds
-                    else:  # 'guesses'
-                        x_value = guesses
-
-                    # Y-axis value
-                    if self.y_axis_type == 'count':
-                        y_value = cracked
-                    else:  # 'percentage'
-                        y_value = (cracked / total) * 100
-
-                    # Extract attack info
-                    guess_base = data.get("guess", {}).get("guess_base", "unknown")
-                    guess_base = guess_base.replace("autocat_new_cracked_potfile", "potfile")
-                    guess_mod = data.get("guess", {}).get("guess_mod", None)
-                    time_start = data.get("time_start", "unknown")
-
-                    key = (f"{time_start}/{guess_base}", guess_mod)
-
-                    # Handle new attack phase
-                    if key != current_identifier:
-                        if current_identifier != "":
-                            # Close previous curve
-                            curves_x.append([curves_x[-1][-1], x_value])
-                            curves_y.append([curves_y[-1][-1], y_value])
-                        else:
-                            # First curve
-                            curves_x.append([0, x_value])
-                            curves_y.append([0, y_value])
-                        current_identifier = key
-                        label_list.append(key)
-                    else:
-                        # Continue current curve
-                        curves_x[-1].append(x_value)
-                        curves_y[-1].append(y_value)
-
-                    # Increment time counter for next iteration
-                    elapsed_seconds += self.status_timer
-
-                except json.JSONDecodeError:
+                    data = json_loads(line)
+                except JSONDecodeError:
+                    # Corrupted record, or a last line cut right after a closing brace
+                    if partial:
+                        break
+                    offset += len(line)
                     continue
 
-        return curves_x, curves_y, label_list
+                offset += len(line)
+
+                # Extract core values
+                progress_list = data.get("progress") or (0,)
+                guesses += progress_list[0]
+
+                recovered = data.get("recovered_hashes") or (0, 0)
+                cracked = recovered[0]
+                total = recovered[1]
+
+                # Extract attack info
+                guess = data.get("guess") or _EMPTY
+                guess_base = guess.get("guess_base", "unknown")
+                guess_mod = guess.get("guess_mod")
+                time_start = data.get("time_start", "unknown")
+                phase = label_cache.get((time_start, guess_base, guess_mod))
+                if phase is None:
+                    phase = label_cache[(time_start, guess_base, guess_mod)] = \
+                        self._make_phase(time_start, guess_base, guess_mod)
+                key = phase[0]
+
+                # Handle new attack phase, starting from the end of the previous curve
+                if key is not current_identifier:
+                    point = (guesses, elapsed_seconds, cracked, total)
+                    curve = tuple(array.array('q', (column[-1], value)) for column, value in zip(curve, point))
+                    curves.append(curve)
+                    append_guesses, append_elapsed, append_cracked, append_total = \
+                        [column.append for column in curve]
+                    current_identifier = key
+                    phases.append(phase)
+                else:
+                    # Continue current curve
+                    append_guesses(guesses)
+                    append_elapsed(elapsed_seconds)
+                    append_cracked(cracked)
+                    append_total(total)
+
+                # Increment time counter for next iteration
+                elapsed_seconds += status_timer
+
+        self._offset = offset
+        self._guesses = guesses
+        self._current_identifier = current_identifier
+        self._elapsed = elapsed_seconds
+
+        self._last_stat = stat_key
+        self._cached_result = (self._curve_arrays(), phases)
+        return self._cached_result
+
+    @staticmethod
+    def _make_phase(time_start, guess_base, guess_mod):
+        """
+        Return the key used to group the points of an attack phase, its legend label
+        and whether it is a potfile attack.
+        """
+        if "autocat_new_cracked_potfile" in guess_base:
+            guess_base = guess_base.replace("autocat_new_cracked_potfile", "potfile")
+        if guess_mod is not None:
+            display_label = f"{guess_base.split('/')[-1]} {guess_mod.split('/')[-1]}"
+        else:
+            display_label = f"brute-force {len(guess_base.split('/')[-1]) //2} characters"
+        return (f"{time_start}/{guess_base}", guess_mod), display_label, "potfile" in guess_base
+
+    def _curve_arrays(self):
+        """
+        Expose the accumulated curves as dicts of int64 NumPy arrays.
+        Only the last curve can still grow and an array.array cannot be resized while
+        a NumPy view of its buffer is alive, so finished curves are returned as cached
+        zero-copy views and the last one as a copy.
+        """
+        if not self._curves:
+            return []
+
+        for k in range(len(self._arrays), len(self._curves) - 1):
+            self._arrays.append({name: np.frombuffer(column, dtype=column.typecode)
+                                 for name, column in zip(CURVE_COLUMNS, self._curves[k])})
+
+        last = {name: np.frombuffer(column, dtype=column.typecode).copy()
+                for name, column in zip(CURVE_COLUMNS, self._curves[-1])}
+        return self._arrays + [last]
 
 
 class PasswordCrackingApp:
@@ -115,8 +241,9 @@ class PasswordCrackingApp:
         self.status_timer = 1
         self.no_potfile_highlight = False
 
-        # Initialize parsers
+        # Initialize parsers, files are parsed concurrently
         self.update_parsers()
+        self._pool = ThreadPoolExecutor(max_workers=min(8, len(self.hashcat_files)))
 
         # Initialize Dash app
         self.app = Dash(__name__)
@@ -124,9 +251,9 @@ class PasswordCrackingApp:
         self._setup_callbacks()
 
     def update_parsers(self):
-        """Update parsers with current settings."""
-        self.parsers = {file: HashcatStatusParser(file, self.x_axis_type, self.y_axis_type, self.status_timer)
-                        for file in self.hashcat_files}
+        """Create one parser per file, along with the file's legend title."""
+        self.parsers = [(f"<b>{Path(file).stem}</b>", HashcatStatusParser(file, self.status_timer))
+                        for file in self.hashcat_files]
 
     def _setup_layout(self):
         """Setup the Dash app layout with controls."""
@@ -199,6 +326,8 @@ class PasswordCrackingApp:
             ], style={'margin': '10px'}),
 
             dcc.Graph(id="live-graph", style={'height': '80vh'}),
+            # What this browser tab holds for each trace, used to patch its figure
+            dcc.Store(id="sent-traces"),
             dcc.Interval(id="interval-component", interval=self.update_interval, n_intervals=0)
         ])
 
@@ -207,91 +336,231 @@ class PasswordCrackingApp:
 
         @self.app.callback(
             [Output("interval-component", "interval"),
-             Output("live-graph", "figure")],
+             Output("live-graph", "figure"),
+             Output("sent-traces", "data")],
             [Input("interval-component", "n_intervals"),
              Input("update-button", "n_clicks")],
             [State("refresh-input", "value"),
              State("x-axis-radio", "value"),
              State("y-axis-radio", "value"),
-             State("potfile-highlight-check", "value")]
+             State("potfile-highlight-check", "value"),
+             State("sent-traces", "data")],
+            # The first parse of a large file can outlast the refresh interval, pause the
+            # timer meanwhile so that refreshes do not pile up behind it
+            running=[(Output("interval-component", "disabled"), True, False),
+                     (Output("update-button", "disabled"), True, False)]
         )
-        def update_graph_and_settings(n_intervals, n_clicks, refresh, x_axis, y_axis, potfile_highlight):
+        def update_graph_and_settings(n_intervals, n_clicks, refresh, x_axis, y_axis, potfile_highlight, sent):
             ctx = callback_context
 
+            trigger = ctx.triggered[0]['prop_id'] if ctx.triggered else None
+
             # Update settings if button was clicked
-            if ctx.triggered and ctx.triggered[0]['prop_id'] == 'update-button.n_clicks':
+            if trigger == 'update-button.n_clicks':
                 self.update_interval = refresh * 1000
                 self.x_axis_type = x_axis
                 self.y_axis_type = y_axis
                 self.no_potfile_highlight = 'highlight' not in potfile_highlight
-                self.update_parsers()
 
-            # Create figure
-            figure = self._create_figure()
+            # Timer refreshes only send the new points, a full figure is sent when the
+            # page is loaded and when settings change
+            if trigger == 'interval-component.n_intervals':
+                figure, sent = self._patch_figure(sent)
+            else:
+                figure, sent = self._create_figure()
 
-            return self.update_interval, figure
+            return self.update_interval, figure, sent
 
-    def _create_figure(self):
-        """Create the plotly figure with current data from all files."""
-        fig = go.Figure()
+    def _render_curves(self):
+        """
+        Parse all files and compute what to draw for each curve.
+        Returns one dict per curve holding the trace identifier, the number of parsed
+        points, the points to draw and how many of them are final (they stay the same
+        when the curve grows), the trace class and its style arguments.
+        """
+        rendered = []
 
-        # Configure axis labels
-        x_axis_title = "Time (seconds)" if self.x_axis_type == 'time' else "Number of hashes tested"
-        y_axis_title = "Cracked passwords (count)" if self.y_axis_type == 'count' else "Cracked passwords (%)"
+        # Settings shared by every curve
+        x_column = "elapsed_seconds" if self.x_axis_type == 'time' else "guesses"
+        as_percentage = self.y_axis_type != 'count'
+        # Special handling for potfile - use black unless disabled
+        potfile_color = None if self.no_potfile_highlight else "black"
+
+        # Parse all files concurrently, then process them in the order they were given
+        # so that the legend stays stable between refreshes
+        futures = [self._pool.submit(parser.parse_status_file) for _, parser in self.parsers]
 
         # Process each file
-        for file_idx, (file_path, parser) in enumerate(self.parsers.items()):
-            curves_x, curves_y, label_list = parser.parse_status_file()
-            file_name = f"<b>{Path(file_path).stem}</b>"
-
-            for k in range(len(curves_x)):
-                # Downsample large datasets
-                if len(curves_x[k]) > 1000:
-                    sample_rate = 60
-                    curves_x_sampled = curves_x[k][::sample_rate]
-                    curves_y_sampled = curves_y[k][::sample_rate]
-
-                    # Ensure last point is included
-                    if (len(curves_x[k]) - 1) % sample_rate != 0:
-                        curves_x_sampled.append(curves_x[k][-1])
-                        curves_y_sampled.append(curves_y[k][-1])
-
-                    curves_x[k] = curves_x_sampled
-                    curves_y[k] = curves_y_sampled
-
-                # Extract label info
-                (guess_base, guess_mod) = label_list[k]
-                if guess_mod != None:
-                    attack_label = f"{guess_base.split('/')[-1]} {guess_mod.split('/')[-1]}"
+        for (file_name, _), future in zip(self.parsers, futures):
+            curves, phases = future.result()
+
+            for k, (curve, (phase_key, attack_label, is_potfile)) in enumerate(zip(curves, phases)):
+                # Select the plotted columns, the parser keeps them between calls so
+                # they must not be modified here
+                curve_x = curve[x_column]
+                if as_percentage:
+                    curve_y = curve["cracked"] * (100.0 / np.maximum(curve["total"], 1))
                 else:
-                    attack_label = f"brute-force {len(guess_base.split('/')[-1]) //2} characters"
-
-                # Special handling for potfile - use black unless disabled
-                if "potfile" in guess_base and not self.no_potfile_highlight:
-                    color = "black"
+                    curve_y = curve["cracked"]
+
+                # Downsample large datasets, the points are picked on the raw cracked
+                # count so that both y-axis types show the same points
+                n = len(curve_x)
+                downsampled = n > DOWNSAMPLE_THRESHOLD
+                if downsampled:
+                    idx, stable = self._downsample_indices(curve["cracked"], DOWNSAMPLE_RATE)
+                    curve_x = curve_x[idx]
+                    curve_y = curve_y[idx]
                 else:
-                    color = None
-
-                fig.add_trace(go.Scatter(
-                    x=curves_x[k],
-                    y=curves_y[k],
-                    mode="lines",
-                    marker_color=color,
-                    name=attack_label,
-                    legendgroup=file_name,
-                    legendgrouptitle_text=file_name if k == 0 else None
-                ))
-
-        fig.update_layout(
-            xaxis_title=x_axis_title,
-            yaxis_title=y_axis_title,
-            template="plotly_white",
-            legend=dict(title="Files & Attack Sequences"),
-            hovermode='x unified',
-            margin=dict(t=30, b=60)
+                    stable = n
+
+                # SVG rendering slows the browser down on large traces, use WebGL for them
+                trace_cls = go.Scattergl if len(curve_x) > 2000 else go.Scatter
+
+                rendered.append({
+                    "id": [file_name, *phase_key],
+                    "n": n,
+                    "downsampled": downsampled,
+                    "x": curve_x,
+                    "y": curve_y,
+                    "stable": stable,
+                    "trace_cls": trace_cls,
+                    "style": dict(
+                        mode="lines",
+                        marker_color=potfile_color if is_potfile else None,
+                        name=attack_label,
+                        legendgroup=file_name,
+                        legendgrouptitle_text=file_name if k == 0 else None
+                    ),
+                })
+
+        return rendered
+
+    def _create_figure(self, rendered=None):
+        """
+        Create the plotly figure with current data from all files.
+        Returns the figure along with the settings it is drawn with and what it holds
+        for each trace, to be kept by the browser tab it is sent to and given back to
+        _patch_figure.
+        """
+        if rendered is None:
+            rendered = self._render_curves()
+
+        traces = [curve["trace_cls"](x=curve["x"], y=curve["y"], **curve["style"]) for curve in rendered]
+
+        sent = {"settings": self._figure_settings(), "traces": [{
+            "id": curve["id"],
+            "n": curve["n"],
+            "downsampled": curve["downsampled"],
+            "trace_type": curve["trace_cls"].__name__,
+            "length": len(curve["x"]),
+            "stable": curve["stable"],
+            "as_list": False,
+        } for curve in rendered]}
+
+        # Configure axis labels
+        x_axis_title = "Time (seconds)" if self.x_axis_type == 'time' else "Number of hashes tested"
+        y_axis_title = "Cracked passwords (count)" if self.y_axis_type == 'count' else "Cracked passwords (%)"
+
+        # Build the figure in one go rather than validating it again on every add_trace
+        figure = go.Figure(
+            data=traces,
+            layout=go.Layout(
+                xaxis_title=x_axis_title,
+                yaxis_title=y_axis_title,
+                template="plotly_white",
+                legend=dict(title="Files & Attack Sequences"),
+                hovermode='x unified',
+                margin=dict(t=30, b=60)
+            )
         )
 
-        return fig
+        return figure, sent
+
+    def _patch_figure(self, sent):
+        """
+        Patch the figure displayed in a browser tab with the points parsed since that
+        tab was last refreshed, so that only those are sent.
+        `sent` is what the tab holds for each trace and the settings its figure was
+        drawn with, as returned by _create_figure or by a previous call. Returns the
+        patch along with the updated `sent`.
+        A full figure is created instead when the settings differ, or when curves
+        appear, shrink or change how they are rendered.
+        """
+        rendered = self._render_curves()
+
+        # Settings may have been changed from another tab since this one was drawn
+        if sent is None or sent["settings"] != self._figure_settings():
+            return self._create_figure(rendered)
+
+        traces_sent = [dict(trace) for trace in sent["traces"]]
+        layout = [(curve["id"], curve["downsampled"], curve["trace_cls"].__name__) for curve in rendered]
+        if layout != [(trace["id"], trace["downsampled"], trace["trace_type"]) for trace in traces_sent] \
+                or any(curve["n"] < trace["n"] for curve, trace in zip(rendered, traces_sent)):
+            return self._create_figure(rendered)
+
+        patched_figure = Patch()
+        changed = False
+        for i, (curve, trace_sent) in enumerate(zip(rendered, traces_sent)):
+            if curve["n"] == trace_sent["n"]:
+                continue
+
+            trace = patched_figure["data"][i]
+            if trace_sent["as_list"]:
+                # Drop the points that were not final yet, then send everything after
+                # the final ones
+                stable = trace_sent["stable"]
+                for _ in range(trace_sent["length"] - stable):
+                    del trace["x"][stable]
+                    del trace["y"][stable]
+                trace["x"].extend(curve["x"][stable:].tolist())
+                trace["y"].extend(curve["y"][stable:].tolist())
+            else:
+                # The full figure sends arrays binary encoded, which the browser cannot
+                # extend, so the trace is sent once more as plain lists
+                trace["x"] = curve["x"].tolist()
+                trace["y"] = curve["y"].tolist()
+
+            trace_sent.update(n=curve["n"], length=len(curve["x"]), stable=curve["stable"], as_list=True)
+            changed = True
+
+        if not changed:
+            return no_update, no_update
+        return patched_figure, {"settings": sent["settings"], "traces": traces_sent}
+
+    def _figure_settings(self):
+        """Settings a figure is drawn with, as kept in the browser tab next to it."""
+        return [self.x_axis_type, self.y_axis_type, self.no_potfile_highlight]
+
+    @staticmethod
+    def _downsample_indices(values, sample_rate):
+        """
+        Return the indices of about one point out of `sample_rate`, chosen so that the
+        sudden jumps of `values` are not flattened.
+        Points are split into buckets of `sample_rate` and each bucket is represented by
+        the point right after its largest increase, together with the point just before
+        it, so that steps stay steep. Flat buckets keep their first point, like a plain
+        stride would. The first and last points are always kept.
+        Also returns how many of the returned indices are final: those picked in
+        complete buckets stay the same when more values are appended.
+        """
+        n = len(values)
+        jumps = np.abs(np.diff(values, prepend=values[0]))
+
+        # Pad the last bucket with zeros, argmax returns the first maximum so the
+        # padding can never be selected
+        n_buckets = -(-n // sample_rate)
+        padded = np.zeros(n_buckets * sample_rate, dtype=jumps.dtype)
+        padded[:n] = jumps
+        idx = np.arange(0, n, sample_rate) + padded.reshape(n_buckets, sample_rate).argmax(axis=1)
+
+        before_jump = idx[jumps[idx] > 0] - 1
+        idx = np.unique(np.concatenate(([0, n - 1], idx, before_jump)))
+
+        # The last point and anything from the last complete bucket's final point on
+        # may be replaced once the curve grows
+        stable = int(np.searchsorted(idx, n // sample_rate * sample_rate - 1))
+        return idx, stable
 
     def run(self, host='127.0.0.1', port=8050):
         """Run the Dash application."""